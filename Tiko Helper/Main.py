@@ -0,0 +1,170 @@
+import json
+import logging
+import os
+import sys
+from functools import lru_cache
+from pathlib import Path
+from typing import NamedTuple
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+CONFIG_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "config.json")
+
+log = logging.getLogger("tiko")
+
+
+@lru_cache(maxsize=4)
+def _load_config_cached(path, mtime_ns):
+    # mtime_ns is only part of the key so edits to the file invalidate
+    # the cached parse; repeated loads of an unchanged file are free.
+    # One read_bytes() syscall instead of a buffered TextIOWrapper with
+    # incremental decode; both parsers accept UTF-8 bytes directly.
+    data = Path(path).read_bytes()
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def load_config():
+    """Load the bot configuration from config.json, cached by mtime."""
+    return _load_config_cached(CONFIG_FILE, os.stat(CONFIG_FILE).st_mtime_ns)
+
+
+class Config(NamedTuple):
+    token: str
+    owner_id: int
+    staff_channel_id: int
+    command_prefixes: tuple
+    log_level: str
+    message_content: bool
+
+
+def _fatal(message):
+    # os._exit skips interpreter finalization -- there is nothing worth
+    # tearing down this early, and it keeps the crash path instant.
+    sys.stderr.write(message + "\n")
+    os._exit(1)
+
+
+def validate_and_load() -> Config:
+    """Single-path startup validation: returns a Config or exits."""
+    try:
+        # Pre-baked by build_constants.py at deploy time: zero parse cost.
+        import constants
+    except ImportError:
+        pass
+    else:
+        cfg = Config(
+            token=os.environ.get("TIKO_HELPER_TOKEN") or constants.TOKEN,
+            owner_id=constants.OWNER_ID,
+            staff_channel_id=constants.STAFF_CHANNEL_ID,
+            command_prefixes=tuple(constants.COMMAND_PREFIXES),
+            log_level=constants.LOG_LEVEL,
+            message_content=constants.MESSAGE_CONTENT,
+        )
+        if not cfg.token:
+            _fatal("No bot token set; export TIKO_HELPER_TOKEN or rerun build_constants.py")
+        return cfg
+    try:
+        config = load_config()
+    except FileNotFoundError:
+        _fatal(f"Config file not found: {CONFIG_FILE}")
+    except ValueError as e:
+        # Covers both json.JSONDecodeError and orjson.JSONDecodeError.
+        _fatal(f"Invalid JSON in config file: {e}")
+    try:
+        cfg = Config(
+            token=os.environ.get("TIKO_HELPER_TOKEN") or config["token"],
+            owner_id=config["owner_id"],
+            staff_channel_id=config["staff_channel_id"],
+            command_prefixes=tuple(config.get("command_prefixes", ["!", "."])),
+            log_level=config.get("log_level", "INFO"),
+            message_content=bool(config.get("message_content", True)),
+        )
+    except KeyError as e:
+        _fatal(f"Missing required config key: {e}")
+    if not cfg.token:
+        # Fail synchronously before any network I/O is attempted; a bad or
+        # missing token otherwise burns seconds in discord.py retry/backoff.
+        _fatal("No bot token set; export TIKO_HELPER_TOKEN or fill config.json")
+    return cfg
+
+
+def build_bot(cfg):
+    # Imported lazily: discord pulls in aiohttp, yarl, multidict and ssl,
+    # which costs hundreds of ms that config-failure paths never need.
+    import discord
+    from discord.ext import commands
+
+    from isolation import IsolationCog
+
+    intents = discord.Intents.default()
+    # With message_content off, Discord stops delivering the text of every
+    # message in every guild; mentions still arrive with content, so
+    # mention-prefixed commands keep working.
+    intents.message_content = cfg.message_content
+    intents.members = True
+
+    if cfg.message_content:
+        prefix = commands.when_mentioned_or(*cfg.command_prefixes)
+    else:
+        prefix = commands.when_mentioned
+    # Don't request GUILD_MEMBERS chunks for every guild on READY and don't
+    # cache members eagerly; moderation commands resolve their targets via
+    # the Member converter, which falls back to fetching on cache miss.
+    bot = commands.Bot(
+        command_prefix=prefix,
+        intents=intents,
+        chunk_guilds_at_startup=False,
+        member_cache_flags=discord.MemberCacheFlags.none(),
+    )
+
+    @bot.event
+    async def on_ready():
+        # when_mentioned_or reformats the mention strings on every message;
+        # once the user id is known the prefix tuple is static, so bind it.
+        prefixes = (f"<@{bot.user.id}> ", f"<@!{bot.user.id}> ")
+        if cfg.message_content:
+            prefixes += cfg.command_prefixes
+        bot.command_prefix = lambda _bot, _message: prefixes
+        log.info("Logged in as %s (ID: %s)", bot.user, bot.user.id)
+
+    async def setup_hook():
+        await bot.add_cog(IsolationCog(bot, cfg.owner_id, cfg.staff_channel_id))
+
+    bot.setup_hook = setup_hook
+    return bot
+
+
+def main():
+    cfg = validate_and_load()
+    # Dict lookup instead of a getattr scan of the logging module, and only
+    # configure the root logger once -- a second basicConfig call would still
+    # take the logging lock and walk the handler list just to no-op.
+    level = logging.getLevelNamesMapping().get(cfg.log_level.upper(), logging.INFO)
+    if not logging.getLogger().handlers:
+        logging.basicConfig(
+            level=level,
+            format="%(asctime)s %(levelname)s %(name)s: %(message)s",
+        )
+    if sys.platform != "win32":
+        try:
+            import uvloop
+        except ImportError:
+            pass
+        else:
+            # Faster event loop for the gateway recv/heartbeat paths.
+            uvloop.install()
+    bot = build_bot(cfg)
+    try:
+        bot.run(cfg.token)
+    except Exception as e:
+        log.error("Failed to start bot: %s", e)
+        exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+"""Generate constants.py from config.json at deploy time.
+
+Running this once bakes the config values into an importable module
+(and its .pyc), so startup skips the open + json.loads entirely.
+Main.py falls back to reading config.json when constants.py is absent.
+"""
+
+import json
+import os
+
+CONFIG_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "config.json")
+CONSTANTS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "constants.py")
+
+
+def build():
+    with open(CONFIG_FILE, "r", encoding="utf-8") as file:
+        config = json.load(file)
+    lines = [
+        "# Generated by build_constants.py -- do not edit, edit config.json and rerun.",
+        f"TOKEN = {config.get('token')!r}",
+        f"OWNER_ID = {config.get('owner_id')!r}",
+        f"STAFF_CHANNEL_ID = {config.get('staff_channel_id')!r}",
+        f"COMMAND_PREFIXES = {tuple(config.get('command_prefixes', ['!', '.']))!r}",
+        f"LOG_LEVEL = {config.get('log_level', 'INFO')!r}",
+        f"MESSAGE_CONTENT = {bool(config.get('message_content', True))!r}",
+        "",
+    ]
+    with open(CONSTANTS_FILE, "w", encoding="utf-8") as file:
+        file.write("\n".join(lines))
+    print(f"Wrote {CONSTANTS_FILE}")
+
+
+if __name__ == "__main__":
+    build()
@@ -0,0 +1,678 @@
+"""Isolation (quarantine) moderation cog for Tiko Helper."""
+
+import asyncio
+import gzip
+import collections
+import json
+import logging
+import os
+from typing import Dict, List, Optional, Union
+
+import discord
+from discord.ext import commands
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+log = logging.getLogger("tiko.isolation")
+
+ISO_PERMS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "isolation_perms.json")
+ISOLATION_ROLE_NAME = "Isolated"
+ISOLATION_CHANNEL_NAME = "isolation"
+QUARANTINE_CHANNEL_NAME = "quarantine"
+
+# Built once at import: PermissionOverwrite.__init__ walks its kwargs into an
+# allow/deny Permissions pair, and these paths never mutate the result.
+_DENY_ALL_OVERWRITE = discord.PermissionOverwrite(
+    view_channel=False,
+    send_messages=False,
+    send_messages_in_threads=False,
+    create_public_threads=False,
+    create_private_threads=False,
+    add_reactions=False,
+    speak=False,
+    connect=False,
+)
+
+
+# Hard ceiling on remembered role lists; entries stranded by failure paths
+# no longer accumulate forever, and evicted ones can still be recovered from
+# the persisted copy.
+_ISOLATION_CACHE_MAX = 10_000
+
+
+def _default_store() -> dict:
+    return {
+        "allowed_ids": [],
+        "roles": {},
+        "channels": {},
+        "isolated_users": [],
+        "cached_roles": {},
+    }
+
+
+_GZIP_MAGIC = b"\x1f\x8b"
+
+
+def _load_store() -> dict:
+    try:
+        with open(ISO_PERMS_FILE, "rb") as file:
+            raw = file.read()
+        # Sniff the gzip magic so stores written before compression landed
+        # keep loading.
+        if raw[:2] == _GZIP_MAGIC:
+            raw = gzip.decompress(raw)
+        # Both parsers take the bytes directly; orjson's C parser makes the
+        # cold-start load cheap even with thousands of tracked ids, and its
+        # JSONDecodeError is a ValueError so the handler below covers both.
+        data = orjson.loads(raw) if orjson is not None else json.loads(raw)
+    except (OSError, ValueError):
+        return _default_store()
+    store = _default_store()
+    for key, default in store.items():
+        if isinstance(data.get(key), type(default)):
+            store[key] = data[key]
+    return store
+
+
+def _int_pairs(mapping: dict):
+    """Yield (int(key), int(value)) pairs, dropping malformed entries.
+
+    A hand-edited or foreign-written store should lose the bad entry, not
+    abort cog load; _load_store only checks the top-level types.
+    """
+    for key, value in mapping.items():
+        try:
+            yield int(key), int(value)
+        except (TypeError, ValueError):
+            log.warning("Dropping malformed store entry %r: %r", key, value)
+
+
+def _save_store(store: dict) -> None:
+    # Write-then-rename so a crash mid-write can never leave a torn file.
+    # compresslevel=1 is near-free CPU-wise and shrinks these int-list
+    # payloads several-fold on top of the compact encoding.
+    if orjson is not None:
+        raw = orjson.dumps(store)
+    else:
+        raw = json.dumps(store, separators=(",", ":")).encode("utf-8")
+    payload = gzip.compress(raw, compresslevel=1)
+    tmp = ISO_PERMS_FILE + ".tmp"
+    with open(tmp, "wb") as file:
+        file.write(payload)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(tmp, ISO_PERMS_FILE)
+
+
+class IsolationCog(commands.Cog):
+    """Commands for isolating misbehaving members behind an Isolated role."""
+
+    # Slot descriptors make these C-level loads in the hot permission helpers;
+    # commands.Cog itself is unslotted, so the instance keeps a __dict__ for
+    # the attributes discord.py's Cog machinery assigns.
+    __slots__ = (
+        "bot",
+        "owner_id",
+        "staff_channel_id",
+        "_allowed_ids",
+        "_roles",
+        "_channels",
+        "_isolated_users",
+        "_isolation_cache",
+        "_iso_role_cache",
+        "_overwrites_cache",
+        "_locks",
+        "_owner_ids",
+        "_dirty",
+        "_flusher_task",
+    )
+
+    def __init__(self, bot, owner_id, staff_channel_id):
+        self.bot = bot
+        self.owner_id = owner_id
+        self.staff_channel_id = staff_channel_id
+        store = _load_store()
+        self._allowed_ids: set[int] = set(store["allowed_ids"])
+        # guild_id -> isolation role id, mirroring the channel mapping:
+        # guild.get_role is a dict probe, the name scan is the fallback.
+        self._roles: Dict[int, int] = dict(_int_pairs(store["roles"]))
+        # guild_id -> isolation channel id; resolving via guild.get_channel
+        # is an O(1) cache hit instead of a name scan over text_channels.
+        self._channels: Dict[int, int] = dict(_int_pairs(store["channels"]))
+        self._isolated_users: set[int] = set(store["isolated_users"])
+        # LRU of (guild_id, user_id) -> cached role ids, oldest evicted first.
+        self._isolation_cache: "collections.OrderedDict[tuple, List[int]]" = (
+            collections.OrderedDict()
+        )
+        for key, role_ids in store["cached_roles"].items():
+            guild_id, _, user_id = key.partition(":")
+            try:
+                cache_key = (int(guild_id), int(user_id))
+            except ValueError:
+                log.warning("Dropping malformed cached-roles key %r", key)
+                continue
+            self._isolation_cache[cache_key] = list(role_ids)
+        self._iso_role_cache: Dict[int, discord.Role] = {}
+        # guild_id -> {"role_id": ..., "ow": overwrites dict} for setup; the
+        # overwrites never mutate for a given role/default-role pair.
+        self._overwrites_cache: Dict[int, dict] = {}
+        self._locks: Dict[tuple, asyncio.Lock] = {}
+        # Filled by cog_load from application_info; owner-gated commands then
+        # reduce to a set probe instead of a REST round-trip.
+        self._owner_ids: set[int] = set()
+        self._dirty = asyncio.Event()
+        self._flusher_task: Optional[asyncio.Task] = None
+
+    async def cog_load(self):
+        try:
+            app = await self.bot.application_info()
+        except discord.HTTPException:
+            log.warning("Could not fetch application info; app-owner checks limited to config owner")
+        else:
+            if app.team:
+                self._owner_ids = {member.id for member in app.team.members}
+            else:
+                self._owner_ids = {app.owner.id}
+        self._flusher_task = asyncio.get_running_loop().create_task(self._flusher())
+
+    async def cog_unload(self):
+        if self._flusher_task is not None:
+            self._flusher_task.cancel()
+            self._flusher_task = None
+        if self._dirty.is_set():
+            _save_store(self._snapshot())
+
+    def _snapshot(self) -> dict:
+        return {
+            "allowed_ids": sorted(self._allowed_ids),
+            "roles": {
+                str(guild_id): role_id
+                for guild_id, role_id in self._roles.items()
+            },
+            "channels": {
+                str(guild_id): channel_id
+                for guild_id, channel_id in self._channels.items()
+            },
+            "isolated_users": sorted(self._isolated_users),
+            "cached_roles": {
+                f"{guild_id}:{user_id}": role_ids
+                for (guild_id, user_id), role_ids in self._isolation_cache.items()
+            },
+        }
+
+    def _persist(self) -> None:
+        # Mark dirty only; the flusher coalesces bursts of mutations (a rapid
+        # admin session, a bulk cleanup) into a single write instead of one
+        # synchronous rewrite per command on the event loop.
+        self._dirty.set()
+
+    async def _flusher(self):
+        while True:
+            await self._dirty.wait()
+            await asyncio.sleep(0.5)
+            self._dirty.clear()
+            try:
+                # The snapshot is taken on the loop; the write+fsync happens
+                # on a worker thread so gateway events keep flowing during
+                # the I/O.
+                await asyncio.to_thread(_save_store, self._snapshot())
+            except Exception:
+                # A failed write (disk full, permissions) must not kill the
+                # flusher; stay dirty so the next cycle retries.
+                log.exception("Failed to persist isolation store; will retry")
+                self._dirty.set()
+
+    # -- permission helpers ----------------------------------------------
+
+    def _is_app_owner(self, ctx) -> bool:
+        if self.owner_id and ctx.author.id == self.owner_id:
+            return True
+        return ctx.author.id in self._owner_ids
+
+    def _is_guild_owner(self, ctx) -> bool:
+        return ctx.guild is not None and ctx.author.id == ctx.guild.owner_id
+
+    def _can_manage(self, ctx) -> bool:
+        return self._is_guild_owner(ctx) or self._is_app_owner(ctx)
+
+    def _member_lock(self, guild_id: int, user_id: int) -> asyncio.Lock:
+        """Serialize isolate/unisolate for one member in one guild.
+
+        Two moderators racing on the same target would otherwise interleave
+        role edits, desync the role cache and double-persist.
+        """
+        if len(self._locks) > 1024:
+            for key in [key for key, lock in self._locks.items() if not lock.locked()]:
+                del self._locks[key]
+        return self._locks.setdefault((guild_id, user_id), asyncio.Lock())
+
+    def _has_isolation_permission(self, member) -> bool:
+        if member.id in self._allowed_ids:
+            return True
+        # Bail out on the first allowed role rather than materializing a
+        # role-id set just to intersect it.
+        allowed = self._allowed_ids
+        for role in member.roles:
+            if role.id in allowed:
+                return True
+        return False
+
+    # -- role cache ------------------------------------------------------
+
+    def _cache_member_roles(self, guild_id: int, user_id: int, role_ids: List[int]) -> None:
+        self._isolation_cache[(guild_id, user_id)] = list(role_ids)
+        # Assigning an existing key leaves its position; an explicit touch
+        # keeps eviction strictly least-recently-isolated.
+        self._isolation_cache.move_to_end((guild_id, user_id))
+        if len(self._isolation_cache) > _ISOLATION_CACHE_MAX:
+            self._isolation_cache.popitem(last=False)
+        self._persist()
+        log.info("Cached roles for user %s in guild %s: %s", user_id, guild_id, role_ids)
+
+    def _pop_cached_member_roles(self, guild_id: int, user_id: int) -> List[int]:
+        role_ids = self._isolation_cache.pop((guild_id, user_id), None)
+        if role_ids is None:
+            log.warning("No cached roles for user %s in guild %s", user_id, guild_id)
+            return []
+        self._persist()
+        log.info("Popped cached roles for user %s in guild %s: %s", user_id, guild_id, role_ids)
+        return role_ids
+
+    # -- lookups ---------------------------------------------------------
+
+    def _get_isolation_role(self, guild) -> Optional[discord.Role]:
+        cached = self._iso_role_cache.get(guild.id)
+        # Identity check against the guild's role cache confirms the handle
+        # is still live without scanning anything.
+        if cached is not None and guild.get_role(cached.id) is cached:
+            return cached
+        role_id = self._roles.get(guild.id)
+        if role_id is not None:
+            role = guild.get_role(role_id)
+            if role is not None:
+                self._iso_role_cache[guild.id] = role
+                return role
+        for role in guild.roles:
+            if role.name == ISOLATION_ROLE_NAME:
+                self._iso_role_cache[guild.id] = role
+                return role
+        return None
+
+    async def _run_bounded(self, coros, limit=10):
+        """Run coroutines concurrently with at most `limit` in flight.
+
+        Returns the gather results with exceptions captured, so callers can
+        count successes without one failed edit aborting the rest.
+        """
+        semaphore = asyncio.Semaphore(limit)
+
+        async def runner(coro):
+            async with semaphore:
+                return await coro
+
+        return await asyncio.gather(*(runner(coro) for coro in coros), return_exceptions=True)
+
+    def _get_staff_channel(self, guild):
+        if not self.staff_channel_id:
+            return None
+        # bot.get_channel is a dict probe into the connection's channel
+        # store; get_all_channels walked every channel of every guild.
+        return self.bot.get_channel(self.staff_channel_id)
+
+    # -- isolation group -------------------------------------------------
+
+    @commands.group(name="isolation", invoke_without_command=True)
+    async def isolation(self, ctx):
+        await ctx.send("Subcommands: setup, show, role add/remove, cleanup, clearcache")
+
+    @isolation.command(name="setup")
+    async def isolation_setup(self, ctx):
+        if not self._can_manage(ctx):
+            await ctx.send("You do not have permission to do that.")
+            return
+        guild = ctx.guild
+
+        role = self._get_isolation_role(guild)
+        if role is None:
+            role = await guild.create_role(name=ISOLATION_ROLE_NAME, reason="Isolation setup")
+        if self._roles.get(guild.id) != role.id:
+            self._roles[guild.id] = role.id
+            self._persist()
+
+        iso_channel_id = self._channels.get(guild.id)
+        coros = []
+        for channel in guild.channels:
+            if channel.id == iso_channel_id:
+                continue
+            # PermissionOverwrite supports ==; one compare replaces the old
+            # per-attribute diff walk, and already-configured channels still
+            # skip the API call entirely.
+            if channel.overwrites_for(role) != _DENY_ALL_OVERWRITE:
+                coros.append(
+                    channel.set_permissions(role, overwrite=_DENY_ALL_OVERWRITE, reason="Isolation setup")
+                )
+        results = await self._run_bounded(coros)
+        updated = sum(1 for result in results if not isinstance(result, Exception))
+
+        target_channel = guild.get_channel(iso_channel_id) if iso_channel_id else None
+        if target_channel is None:
+            # Cache miss (first run, or the channel was deleted): one walk
+            # of text_channels covers both names, preferring "isolation" and
+            # keeping the first "quarantine" as the fallback.
+            fallback = None
+            for channel in guild.text_channels:
+                if channel.name == ISOLATION_CHANNEL_NAME:
+                    target_channel = channel
+                    break
+                if channel.name == QUARANTINE_CHANNEL_NAME and fallback is None:
+                    fallback = channel
+            if target_channel is None:
+                target_channel = fallback
+        cached_ow = self._overwrites_cache.get(guild.id)
+        if cached_ow is None or cached_ow["role_id"] != role.id:
+            cached_ow = {
+                "role_id": role.id,
+                "ow": {
+                    guild.default_role: discord.PermissionOverwrite(view_channel=False),
+                    role: discord.PermissionOverwrite(
+                        view_channel=True,
+                        send_messages=True,
+                        add_reactions=True,
+                        read_message_history=True,
+                    ),
+                },
+            }
+            self._overwrites_cache[guild.id] = cached_ow
+        overwrites = cached_ow["ow"]
+        if target_channel is None:
+            target_channel = await guild.create_text_channel(
+                ISOLATION_CHANNEL_NAME, overwrites=overwrites, reason="Isolation setup"
+            )
+        elif target_channel.overwrites != overwrites:
+            # Re-running setup on a configured guild is common; matching
+            # overwrites mean the edit would be a pure no-op REST call
+            # counted against the channel-edit rate limit.
+            await target_channel.edit(overwrites=overwrites, reason="Isolation setup")
+        if self._channels.get(guild.id) != target_channel.id:
+            self._channels[guild.id] = target_channel.id
+            self._persist()
+
+        await ctx.send(
+            f"Isolation setup complete: role {role.mention}, channel {target_channel.mention}, "
+            f"{updated} channel(s) updated."
+        )
+
+    @isolation.command(name="show")
+    async def isolation_show(self, ctx):
+        guild = ctx.guild
+        lines = ["**Isolation configuration**"]
+
+        # One snapshot per invocation instead of re-walking discord.py's
+        # internal structures for every configured id below.
+        members_by_id = {member.id: member for member in guild.members}
+        roles_by_id = {role.id: role for role in guild.roles}
+        # The id->channel dict discord.py already maintains; no need to
+        # rebuild it or to fall back to the bot-wide cross-guild search.
+        channels_by_id = guild._channels
+
+        allowed = []
+        for allowed_id in self._allowed_ids:
+            member = members_by_id.get(allowed_id)
+            if member is not None:
+                allowed.append(member.mention)
+                continue
+            role = roles_by_id.get(allowed_id)
+            allowed.append(role.mention if role else str(allowed_id))
+        lines.append("Allowed: " + (", ".join(allowed) if allowed else "nobody"))
+
+        iso_role_id = self._roles.get(guild.id)
+        iso_role = roles_by_id.get(iso_role_id) if iso_role_id else None
+        if iso_role is not None:
+            lines.append(f"Role: {iso_role.mention}")
+        else:
+            lines.append("Role: " + (str(iso_role_id) if iso_role_id else "unset"))
+
+        iso_channel_id = self._channels.get(guild.id)
+        iso_channel = channels_by_id.get(iso_channel_id) if iso_channel_id else None
+        if iso_channel is not None:
+            lines.append(f"Channel: {iso_channel.mention}")
+        else:
+            lines.append("Channel: " + (str(iso_channel_id) if iso_channel_id else "unset"))
+
+        isolated = []
+        for user_id in self._isolated_users:
+            member = members_by_id.get(user_id)
+            isolated.append(member.mention if member else str(user_id))
+        lines.append("Isolated: " + (", ".join(isolated) if isolated else "nobody"))
+
+        await ctx.send("\n".join(lines))
+
+    @isolation.group(name="role", invoke_without_command=True)
+    async def isolation_role(self, ctx):
+        await ctx.send("Subcommands: add, remove")
+
+    @isolation_role.command(name="add")
+    async def isolation_role_add(self, ctx, role: discord.Role):
+        if not self._can_manage(ctx):
+            await ctx.send("You do not have permission to do that.")
+            return
+        if self._roles.get(ctx.guild.id) != role.id:
+            self._roles[ctx.guild.id] = role.id
+            self._iso_role_cache.pop(ctx.guild.id, None)
+            self._persist()
+        await ctx.send(f"{role.mention} registered as the isolation role.")
+
+    @isolation_role.command(name="remove")
+    async def isolation_role_remove(self, ctx, role: discord.Role):
+        if not self._can_manage(ctx):
+            await ctx.send("You do not have permission to do that.")
+            return
+        if self._roles.get(ctx.guild.id) == role.id:
+            del self._roles[ctx.guild.id]
+            self._iso_role_cache.pop(ctx.guild.id, None)
+            self._persist()
+        await ctx.send(f"{role.mention} removed as the isolation role.")
+
+    @isolation.command(name="cleanup")
+    async def isolation_cleanup(self, ctx):
+        if not self._can_manage(ctx):
+            await ctx.send("You do not have permission to do that.")
+            return
+        guild = ctx.guild
+        if not self._isolated_users:
+            # Nothing tracked means nothing to reconcile; don't walk the
+            # guild's entire ban list for a guaranteed no-op.
+            await ctx.send("No isolated users tracked; nothing to clean.")
+            return
+
+        tracked = self._isolated_users
+        hits = 0
+        banned_ids = set()
+        add = banned_ids.add
+        try:
+            # guild.bans is an async iterator in discord.py 2.x; streaming it
+            # keeps memory at one page (1000 entries) and lets the library's
+            # rate limiter pace the pagination requests.
+            async for entry in guild.bans(limit=None):
+                # getattr with a default skips the truthiness dispatch on the
+                # User object; BanEntry.user is a User or (rarely) None.
+                uid = getattr(entry.user, "id", None)
+                if uid is not None:
+                    add(uid)
+                    if uid in tracked:
+                        hits += 1
+                        if hits == len(tracked):
+                            # Every tracked user is accounted for; further
+                            # pages cannot change the outcome.
+                            break
+        except discord.HTTPException:
+            pass
+
+        removed_set = self._isolated_users & banned_ids
+        removed = len(removed_set)
+        if removed:
+            self._isolated_users -= removed_set
+            self._persist()
+        await ctx.send(f"Cleanup complete: removed {removed} banned user(s) from the isolation list.")
+
+    @isolation.command(name="clearcache")
+    async def isolation_clearcache(self, ctx):
+        if not self._is_app_owner(ctx):
+            await ctx.send("You do not have permission to do that.")
+            return
+        count = len(self._isolation_cache)
+        if count == 0:
+            await ctx.send("Isolation cache is already empty.")
+            return
+        self._isolation_cache.clear()
+        self._persist()
+        await ctx.send(f"Isolation cache cleared ({count} entries).")
+
+    # -- isoperm group ---------------------------------------------------
+
+    @commands.group(name="isoperm", invoke_without_command=True)
+    async def isoperm(self, ctx):
+        await ctx.send("Subcommands: add, remove")
+
+    @isoperm.command(name="add")
+    async def isoperm_add(self, ctx, target: Union[discord.Member, discord.Role]):
+        if not self._can_manage(ctx):
+            await ctx.send("You do not have permission to do that.")
+            return
+        if target.id not in self._allowed_ids:
+            self._allowed_ids.add(target.id)
+            self._persist()
+        await ctx.send(f"{target.mention} may now use isolation commands.")
+
+    @isoperm.command(name="remove")
+    async def isoperm_remove(self, ctx, target: Union[discord.Member, discord.Role]):
+        if not self._can_manage(ctx):
+            await ctx.send("You do not have permission to do that.")
+            return
+        if target.id in self._allowed_ids:
+            self._allowed_ids.discard(target.id)
+            self._persist()
+        await ctx.send(f"{target.mention} may no longer use isolation commands.")
+
+    # -- isolate / unisolate ---------------------------------------------
+
+    @commands.command(name="isolate")
+    async def isolate(self, ctx, target: discord.Member = None, *, reason: str = "No reason provided"):
+        if target is None:
+            await ctx.send("Usage: isolate @member [reason]")
+            return
+        if not (self._has_isolation_permission(ctx.author) or self._can_manage(ctx)):
+            await ctx.send("You do not have permission to do that.")
+            return
+        guild = ctx.guild
+        async with self._member_lock(guild.id, target.id):
+            # Checked under the lock so a racing double-invocation exits here
+            # instead of re-sweeping every channel for a no-op.
+            if target.id in self._isolated_users:
+                await ctx.send(f"{target.mention} is already isolated.")
+                return
+            isolation_role = self._get_isolation_role(guild)
+
+            # target.roles[0] is always @everyone, so slicing it off avoids the
+            # per-role is_default() calls.
+            current_roles = target.roles[1:]
+            role_ids = [role.id for role in current_roles]
+            self._cache_member_roles(guild.id, target.id, role_ids)
+
+            if isolation_role is not None:
+                keep = [role for role in current_roles if role.managed]
+                await target.edit(roles=keep + [isolation_role], reason=reason)
+            else:
+                iso_channel_id = self._channels.get(guild.id)
+                await self._run_bounded(
+                    channel.set_permissions(target, overwrite=_DENY_ALL_OVERWRITE, reason=reason)
+                    for channel in guild.channels
+                    if channel.id != iso_channel_id
+                    and channel.overwrites_for(target) != _DENY_ALL_OVERWRITE
+                )
+
+            allow = discord.PermissionOverwrite(
+                view_channel=True, send_messages=True, read_message_history=True
+            )
+            iso_channel = guild._channels.get(self._channels.get(guild.id))
+            if iso_channel is not None:
+                await iso_channel.set_permissions(target, overwrite=allow, reason=reason)
+
+            if target.id not in self._isolated_users:
+                self._isolated_users.add(target.id)
+                self._persist()
+
+            staff_channel = self._get_staff_channel(guild)
+            if staff_channel is not None:
+                await staff_channel.send(f"{target} was isolated by {ctx.author}: {reason}")
+            await ctx.send(f"{target.mention} has been isolated.")
+
+    @commands.command(name="unisolate")
+    async def unisolate(self, ctx, target: discord.Member = None, *, reason: str = "No reason provided"):
+        if target is None:
+            await ctx.send("Usage: unisolate @member [reason]")
+            return
+        if not (self._has_isolation_permission(ctx.author) or self._can_manage(ctx)):
+            await ctx.send("You do not have permission to do that.")
+            return
+        guild = ctx.guild
+        async with self._member_lock(guild.id, target.id):
+            # Checked under the lock so a racing double-invocation exits here
+            # instead of popping an empty cache and re-editing for a no-op.
+            if target.id not in self._isolated_users:
+                await ctx.send(f"{target.mention} is not isolated.")
+                return
+            me = guild.me
+            isolation_role = self._get_isolation_role(guild)
+
+            cached = self._pop_cached_member_roles(guild.id, target.id)
+            # One pass over guild.roles builds the assignable set; the old
+            # per-id get_role calls re-walked the role cache for every entry.
+            roles_by_id = {role.id: role for role in guild.roles if role < me.top_role}
+            roles_to_apply = [
+                roles_by_id[role_id] for role_id in cached if role_id in roles_by_id
+            ]
+
+            base = [role for role in target.roles[1:] if role is not isolation_role]
+            merged = base + [role for role in roles_to_apply if role not in base]
+            await target.edit(roles=merged, reason=reason)
+
+            # Most channels carry no per-member overwrite for the target; checking
+            # the cache first skips the HTTP round-trip for every one of those.
+            await self._run_bounded(
+                channel.set_permissions(target, overwrite=None, reason=reason)
+                for channel in guild.channels
+                if not channel.overwrites_for(target).is_empty()
+            )
+
+            self._isolated_users.discard(target.id)
+            self._persist()
+
+            staff_channel = self._get_staff_channel(guild)
+            if staff_channel is not None:
+                await staff_channel.send(f"{target} was released from isolation by {ctx.author}: {reason}")
+            await ctx.send(f"{target.mention} has been released from isolation.")
+
+    # -- listeners -------------------------------------------------------
+
+    @commands.Cog.listener()
+    async def on_guild_role_delete(self, role):
+        cached = self._iso_role_cache.get(role.guild.id)
+        if cached is not None and cached.id == role.id:
+            self._iso_role_cache.pop(role.guild.id, None)
+
+    @commands.Cog.listener()
+    async def on_member_join(self, member):
+        if member.id not in self._isolated_users:
+            return
+        try:
+            await member.ban(reason="Rejoined the server while isolated")
+        except discord.NotFound:
+            # Already gone (left again or banned by a racing event) -- the
+            # duplicate ban would just 404.
+            pass
+        except discord.Forbidden:
+            log.warning("Missing permission to ban rejoining isolated user %s", member.id)